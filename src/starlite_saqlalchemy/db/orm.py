@@ -2,16 +2,14 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Any, TypeVar
+from typing import TypeVar
 from uuid import UUID, uuid4
 
 from sqlalchemy import MetaData
 from sqlalchemy.dialects import postgresql as pg
-from sqlalchemy.event import listens_for
 from sqlalchemy.orm import (
     DeclarativeBase,
     Mapped,
-    Session,
     declarative_mixin,
     declared_attr,
     mapped_column,
@@ -35,23 +33,6 @@ convention = {
 """Templates for automated constraint name generation."""
 
 
-@listens_for(Session, "before_flush")
-def touch_updated_timestamp(session: Session, *_: Any) -> None:
-    """Set timestamp on update.
-
-    Called from SQLAlchemy's
-    [`before_flush`][sqlalchemy.orm.SessionEvents.before_flush] event to bump the `updated`
-    timestamp on modified instances.
-
-    Args:
-        session: The sync [`Session`][sqlalchemy.orm.Session] instance that underlies the async
-            session.
-    """
-    for instance in session.dirty:
-        if hasattr(instance, "updated"):
-            instance.updated = datetime.now()
-
-
 @declarative_mixin
 class CommonColumns:
     """Common functionality shared between all declarative models."""
@@ -82,9 +63,15 @@ class AuditColumns:
     )
     """Date/time of instance creation."""
     updated: Mapped[datetime] = mapped_column(
-        default=datetime.now, info={DTO_KEY: dto.DTOField(mark=dto.Mark.READ_ONLY)}
+        default=datetime.now,
+        onupdate=datetime.now,
+        info={DTO_KEY: dto.DTOField(mark=dto.Mark.READ_ONLY)},
     )
-    """Date/time of instance last update."""
+    """Date/time of instance last update.
+
+    Bumped by SQLAlchemy whenever an `UPDATE` is emitted for the row, including bulk `update()`
+    statements.
+    """
 
 
 meta = MetaData(naming_convention=convention)
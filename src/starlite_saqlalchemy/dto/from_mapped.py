@@ -108,13 +108,14 @@ class FromMapped(BaseModel, Generic[AnyDeclarative]):
         this dataclass.
         """
         as_model = {}
-        for pydantic_field in self.__fields__.values():
-            value = getattr(self, pydantic_field.name)
+        # field values live in `__dict__`, reading them from there avoids an attribute lookup per
+        # field and, unlike `.dict()`, doesn't recursively copy nested values
+        for name, value in self.__dict__.items():
             if isinstance(value, (list, tuple)):
                 value = [el.to_mapped() if isinstance(el, FromMapped) else el for el in value]
-            if isinstance(value, FromMapped):
+            elif isinstance(value, FromMapped):
                 value = value.to_mapped()
-            as_model[pydantic_field.name] = value
+            as_model[name] = value
         return cast("AnyDeclarative", self.__sqla_model__(**as_model))
 
     @classmethod
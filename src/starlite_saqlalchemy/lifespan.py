@@ -1,32 +1,61 @@
 """Application lifespan handlers."""
 # pylint: disable=broad-except,import-outside-toplevel
+from __future__ import annotations
+
 import asyncio
 import logging
+from typing import TYPE_CHECKING
 
 import starlite
 
 from starlite_saqlalchemy import constants, settings
 
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+    from typing import Any
+
 logger = logging.getLogger(__name__)
 
+READY_BACKOFF_MIN = 0.1
+"""Seconds to wait after the first failed readiness probe."""
+READY_BACKOFF_MAX = 5.0
+"""Cap on the seconds to wait between readiness probes."""
+READY_PROBE_TIMEOUT = 2.0
+"""Seconds to wait for a single readiness probe, so a hung connection doesn't stall startup."""
+
+
+async def _wait_until_ready(name: str, probe: Callable[[], Awaitable[Any]]) -> None:
+    """Call `probe` until it succeeds, backing off exponentially between
+    attempts.
+
+    Args:
+        name: Name of the service, for logging.
+        probe: Raises if the service isn't ready.
+    """
+    delay = READY_BACKOFF_MIN
+    while True:
+        try:
+            await asyncio.wait_for(probe(), timeout=READY_PROBE_TIMEOUT)
+        except Exception as exc:
+            logger.info("Waiting for %s: %r", name, exc)
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, READY_BACKOFF_MAX)
+        else:
+            logger.info("%s OK!", name)
+            break
+
 
 async def _db_ready() -> None:
     """Wait for database to become responsive."""
     if constants.IS_SQLALCHEMY_INSTALLED:
-        from sqlalchemy import text
-
         from starlite_saqlalchemy.db import engine
+        from starlite_saqlalchemy.repository.sqlalchemy import SELECT_ONE
 
-        while True:
-            try:
-                async with engine.begin() as conn:
-                    await conn.execute(text("SELECT 1"))
-            except Exception as exc:
-                logger.info("Waiting for DB: %s", exc)
-                await asyncio.sleep(5)
-            else:
-                logger.info("DB OK!")
-                break
+        async def probe() -> None:
+            async with engine.begin() as conn:
+                await conn.execute(SELECT_ONE)
+
+        await _wait_until_ready("DB", probe)
 
 
 async def _redis_ready() -> None:
@@ -34,20 +63,17 @@ async def _redis_ready() -> None:
     if constants.IS_REDIS_INSTALLED:
         from starlite_saqlalchemy import redis
 
-        while True:
-            try:
-                await redis.client.ping()
-            except Exception as exc:
-                logger.info("Waiting  for Redis: %s", exc)
-                await asyncio.sleep(5)
-            else:
-                logger.info("Redis OK!")
-                break
+        await _wait_until_ready("Redis", redis.client.ping)
 
 
 async def before_startup_handler(_: starlite.Starlite) -> None:
-    """Do things before the app starts up."""
+    """Do things before the app starts up.
+
+    Readiness checks are independent of each other, so are awaited concurrently.
+    """
+    checks: list[Awaitable[None]] = []
     if settings.app.CHECK_DB_READY:
-        await _db_ready()
+        checks.append(_db_ready())
     if settings.app.CHECK_REDIS_READY:
-        await _redis_ready()
+        checks.append(_redis_ready())
+    await asyncio.gather(*checks)
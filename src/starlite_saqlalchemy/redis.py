@@ -7,8 +7,16 @@ from starlite_saqlalchemy import settings
 
 __all__ = ["client"]
 
-client: Redis[bytes] = Redis.from_url(settings.redis.URL)
+client: Redis[bytes] = Redis.from_url(
+    settings.redis.URL,
+    max_connections=settings.redis.POOL_MAX_CONNECTIONS,
+    socket_keepalive=settings.redis.SOCKET_KEEPALIVE,
+    health_check_interval=settings.redis.HEALTH_CHECK_INTERVAL,
+)
 """Async [`Redis`][redis.Redis] instance.
 
+Its connection pool is shared by the cache backend and the worker queue, and is disconnected when
+the client is closed.
+
 Configure via [CacheSettings][starlite_saqlalchemy.settings.RedisSettings].
 """
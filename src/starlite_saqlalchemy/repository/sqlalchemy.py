@@ -2,10 +2,12 @@
 from __future__ import annotations
 
 from contextlib import contextmanager
-from typing import TYPE_CHECKING, Any, Generic, Literal, TypeVar
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, ClassVar, Generic, Literal, TypeVar, cast
 
-from sqlalchemy import select, text
+from sqlalchemy import ARRAY, any_, literal, select, text
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.orm.attributes import instance_state
 
 from starlite_saqlalchemy.exceptions import ConflictError, StarliteSaqlalchemyError
 from starlite_saqlalchemy.repository.abc import AbstractRepository
@@ -27,6 +29,7 @@ if TYPE_CHECKING:
     from starlite_saqlalchemy.repository.types import FilterTypes
 
 __all__ = [
+    "SELECT_ONE",
     "SQLAlchemyRepository",
     "ModelT",
 ]
@@ -35,6 +38,40 @@ T = TypeVar("T")
 ModelT = TypeVar("ModelT", bound="orm.Base | orm.AuditBase")
 SQLARepoT = TypeVar("SQLARepoT", bound="SQLAlchemyRepository")
 
+SELECT_ONE = text("SELECT 1")
+"""Statement used to check that the database is responsive.
+
+Built once and shared, so each check reuses the same construct.
+"""
+
+
+@lru_cache(maxsize=None)
+def _select_model(model_type: type[ModelT]) -> Select[tuple[ModelT]]:
+    """Build the default `SELECT` for `model_type` once.
+
+    `Select` is generative, so repository instances can safely share the same base statement.
+    """
+    return select(model_type)
+
+
+@lru_cache(maxsize=256)
+def _columns_for(model_type: type[Any], keys: tuple[str, ...]) -> tuple[Any, ...]:
+    """Resolve the attributes named by `keys` on `model_type`.
+
+    Filters tend to be applied with the same attribute names for a given endpoint, so we cache the
+    lookups rather than walking the descriptors of the mapped class on every query.
+    """
+    return tuple(getattr(model_type, key) for key in keys)
+
+
+async def _add_to_session(session: AsyncSession, model: ModelT) -> ModelT:
+    session.add(model)
+    return model
+
+
+async def _merge_into_session(session: AsyncSession, model: ModelT) -> ModelT:
+    return await session.merge(model)
+
 
 @contextmanager
 def wrap_sqlalchemy_exception() -> Any:
@@ -60,6 +97,35 @@ def wrap_sqlalchemy_exception() -> Any:
 class SQLAlchemyRepository(AbstractRepository[ModelT], Generic[ModelT]):
     """SQLAlchemy based implementation of the repository interface."""
 
+    yield_per: int | None = None
+    """If set, unpaginated calls to `list()` fetch this many rows from the database at a time.
+
+    Not compatible with eager loaders that require rows to be buffered or uniqued, e.g.,
+    `subqueryload()`, or `joinedload()` of a collection, so streaming is opt-in.
+    """
+    in_list_max = 1000
+    """Largest collection that `CollectionFilter` renders as an `IN` list.
+
+    Larger collections are bound as a single PostgreSQL array, i.e., `= ANY($1)`, so the statement
+    stays within the bind parameter limit and its SQL doesn't vary with the number of values.
+    """
+    _attach_strategies: ClassVar[
+        dict[str, abc.Callable[[AsyncSession, Any], abc.Awaitable[Any]]]
+    ] = {"add": _add_to_session, "merge": _merge_into_session}
+    """Strategies for `_attach_to_session()`, keyed by name."""
+    _id_column: ClassVar[Any]
+    """Attribute of `model_type` named by `id_attribute`, resolved once per subclass."""
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        """Resolve `_id_column` from the `model_type` of the subclass.
+
+        Subclasses without a `model_type`, e.g., generic intermediate bases, are skipped.
+        """
+        super().__init_subclass__(**kwargs)
+        model_type = getattr(cls, "model_type", None)
+        if model_type is not None:
+            cls._id_column = getattr(model_type, cls.id_attribute)
+
     def __init__(
         self, *, session: AsyncSession, select_: Select[tuple[ModelT]] | None = None, **kwargs: Any
     ) -> None:
@@ -70,7 +136,10 @@ class SQLAlchemyRepository(AbstractRepository[ModelT], Generic[ModelT]):
         """
         super().__init__(**kwargs)
         self.session = session
-        self._select = select(self.model_type) if select_ is None else select_
+        if select_ is None:
+            # mypy doesn't treat class objects as `Hashable`
+            select_ = _select_model(self.model_type)  # type:ignore[arg-type]
+        self._select = select_
 
     async def add(self, data: ModelT) -> ModelT:
         """Add `data` to the collection.
@@ -84,7 +153,10 @@ class SQLAlchemyRepository(AbstractRepository[ModelT], Generic[ModelT]):
         with wrap_sqlalchemy_exception():
             instance = await self._attach_to_session(data)
             await self.session.flush()
-            await self.session.refresh(instance)
+            # client-side defaults are populated by the flush, so we only need another round trip
+            # if something, e.g., a relationship or server default, is yet to be loaded
+            if instance_state(instance).unloaded:
+                await self.session.refresh(instance)
             self.session.expunge(instance)
             return instance
 
@@ -120,8 +192,8 @@ class SQLAlchemyRepository(AbstractRepository[ModelT], Generic[ModelT]):
             RepositoryNotFoundException: If no instance found identified by `id_`.
         """
         with wrap_sqlalchemy_exception():
-            self._filter_select_by_kwargs(**{self.id_attribute: id_})
-            instance = (await self._execute()).scalar_one_or_none()
+            self._select = self._select.where(self._id_column == id_)
+            instance = (await self.session.execute(self._select)).scalar_one_or_none()
             instance = self.check_not_found(instance)
             self.session.expunge(instance)
             return instance
@@ -136,10 +208,12 @@ class SQLAlchemyRepository(AbstractRepository[ModelT], Generic[ModelT]):
         Returns:
             The list of instances, after filtering applied.
         """
+        paginated = False
         for filter_ in filters:
             match filter_:
                 case LimitOffset(limit, offset):
                     self._apply_limit_offset_pagination(limit, offset)
+                    paginated = True
                 case BeforeAfter(field_name, before, after):
                     self._filter_on_datetime_field(field_name, before, after)
                 case CollectionFilter(field_name, values):
@@ -149,10 +223,21 @@ class SQLAlchemyRepository(AbstractRepository[ModelT], Generic[ModelT]):
         self._filter_select_by_kwargs(**kwargs)
 
         with wrap_sqlalchemy_exception():
-            result = await self._execute()
-            instances = list(result.scalars())
-            for instance in instances:
-                self.session.expunge(instance)
+            if paginated or self.yield_per is None:
+                result = await self.session.execute(self._select)
+                # `all()` already returns a list, there's no need to copy it
+                instances = cast("list[ModelT]", result.scalars().all())
+                self._expunge_many(instances)
+                return instances
+            # without a limit the result set is unbounded, so stream it rather than have the
+            # driver buffer every row before the first instance is loaded
+            stream = await self.session.stream(
+                self._select.execution_options(yield_per=self.yield_per)
+            )
+            instances = []
+            async for partition in stream.scalars().partitions():
+                self._expunge_many(partition)
+                instances.extend(partition)
             return instances
 
     async def update(self, data: ModelT) -> ModelT:
@@ -170,9 +255,11 @@ class SQLAlchemyRepository(AbstractRepository[ModelT], Generic[ModelT]):
         """
         with wrap_sqlalchemy_exception():
             id_ = self.get_id_attribute_value(data)
-            # this will raise for not found, and will put the item in the session
-            await self.get(id_)
-            # this will merge the inbound data to the instance we just put in the session
+            # this will raise for not found, and will leave the item in the session's identity map
+            result = await self.session.execute(self._select.where(self._id_column == id_))
+            self.check_not_found(result.scalar_one_or_none())
+            # this will merge the inbound data to the instance we just put in the session, without
+            # needing to select it again
             instance = await self._attach_to_session(data, strategy="merge")
             await self.session.flush()
             await self.session.refresh(instance)
@@ -224,7 +311,7 @@ class SQLAlchemyRepository(AbstractRepository[ModelT], Generic[ModelT]):
             `True` if healthy.
         """
         return (  # type:ignore[no-any-return]  # pragma: no cover
-            await session.execute(text("SELECT 1"))
+            await session.execute(SELECT_ONE)
         ).scalar_one() == 1
 
     # the following is all sqlalchemy implementation detail, and shouldn't be directly accessed
@@ -247,14 +334,23 @@ class SQLAlchemyRepository(AbstractRepository[ModelT], Generic[ModelT]):
             Instance attached to the session - if `"merge"` strategy, may not be same instance
             that was provided.
         """
-        match strategy:  # noqa: R503
-            case "add":
-                self.session.add(model)
-                return model
-            case "merge":
-                return await self.session.merge(model)
-            case _:
-                raise ValueError("Unexpected value for `strategy`, must be `'add'` or `'merge'`")
+        try:
+            attach = self._attach_strategies[strategy]
+        except KeyError:
+            raise ValueError(
+                "Unexpected value for `strategy`, must be `'add'` or `'merge'`"
+            ) from None
+        return await attach(self.session, model)  # type:ignore[no-any-return]
+
+    def _expunge_many(self, instances: abc.Iterable[ModelT]) -> None:
+        """Detach `instances` from the session in a single pass.
+
+        We don't use `expunge_all()` as that would also discard any pending objects that the caller
+        has added to the session.
+        """
+        expunge = self.session.expunge
+        for instance in instances:
+            expunge(instance)
 
     async def _execute(self) -> Result[tuple[ModelT, ...]]:
         return await self.session.execute(self._select)
@@ -262,17 +358,30 @@ class SQLAlchemyRepository(AbstractRepository[ModelT], Generic[ModelT]):
     def _filter_in_collection(self, field_name: str, values: abc.Collection[Any]) -> None:
         if not values:
             return
-        self._select = self._select.where(getattr(self.model_type, field_name).in_(values))
+        (field,) = _columns_for(self.model_type, (field_name,))  # type:ignore[arg-type]
+        if len(values) > self.in_list_max:
+            array = literal(list(values), ARRAY(field.type))
+            self._select = self._select.where(field == any_(array))
+        else:
+            self._select = self._select.where(field.in_(values))
 
     def _filter_on_datetime_field(
         self, field_name: str, before: datetime | None, after: datetime | None
     ) -> None:
-        field = getattr(self.model_type, field_name)
+        if before is None and after is None:
+            return
+        (field,) = _columns_for(self.model_type, (field_name,))  # type:ignore[arg-type]
+        criteria = []
         if before is not None:
-            self._select = self._select.where(field < before)
+            criteria.append(field < before)
         if after is not None:
-            self._select = self._select.where(field > before)
+            criteria.append(field > after)
+        self._select = self._select.where(*criteria)
 
     def _filter_select_by_kwargs(self, **kwargs: Any) -> None:
-        for key, val in kwargs.items():
-            self._select = self._select.where(getattr(self.model_type, key) == val)
+        if not kwargs:
+            return
+        columns = _columns_for(self.model_type, tuple(kwargs))  # type:ignore[arg-type]
+        self._select = self._select.where(
+            *(column == val for column, val in zip(columns, kwargs.values()))
+        )
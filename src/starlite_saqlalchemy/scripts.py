@@ -30,7 +30,7 @@ def run_app() -> None:
         app=settings.server.APP_LOC,
         factory=settings.server.APP_LOC_IS_FACTORY,
         host=settings.server.HOST,
-        loop="auto",
+        loop="uvloop",
         port=settings.server.PORT,
         reload=should_reload,
         reload_dirs=reload_dirs,
@@ -211,6 +211,19 @@ class RedisSettings(BaseSettings):
 
     URL: AnyUrl = parse_obj_as(AnyUrl, "redis://localhost:6379/0")
     """A Redis connection URL."""
+    POOL_MAX_CONNECTIONS: int | None = None
+    """Max connections held by the pool shared by the cache and the worker. `None` for no limit.
+
+    Once the limit is reached, attempts to take another connection raise, so leave room for the
+    connection each worker holds while it waits for jobs.
+    """
+    SOCKET_KEEPALIVE: bool = True
+    """Enable TCP keepalive on pooled connections, so idle connections aren't silently dropped."""
+    HEALTH_CHECK_INTERVAL: int = 0
+    """Seconds a pooled connection can be idle before it is checked with a `PING` when next used.
+
+    `0` to disable.
+    """
 
 
 # noinspection PyUnresolvedReferences
@@ -305,6 +318,12 @@ class WorkerSettings(BaseSettings):
     - This always includes jitter, where the final retry delay is a random number between 0 and the calculated retry delay.
     - If retry_backoff is set to a number, that number is the maximum retry delay, in seconds."
     """
+    ENQUEUE_BATCH_MAX_SIZE: int = 50
+    """Max jobs written in a single pipeline when coalescing concurrent enqueues. `0` to disable.
+
+    While a job is being enqueued, jobs enqueued concurrently are buffered, and then written to
+    redis together once it completes. Negative values also disable this.
+    """
 
 
 # `.parse_obj()` thing is a workaround for pyright and pydantic interplay, see:
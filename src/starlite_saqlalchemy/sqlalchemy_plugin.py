@@ -3,7 +3,6 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING, cast
 
-from sqlalchemy import text
 from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from starlite.plugins.sql_alchemy import SQLAlchemyConfig, SQLAlchemyPlugin
 from starlite.plugins.sql_alchemy.config import (
@@ -13,6 +12,7 @@ from starlite.plugins.sql_alchemy.config import (
 
 from starlite_saqlalchemy import db, settings
 from starlite_saqlalchemy.health import AbstractHealthCheck
+from starlite_saqlalchemy.repository.sqlalchemy import SELECT_ONE
 
 if TYPE_CHECKING:
     from sqlalchemy.ext.asyncio import AsyncSession
@@ -63,7 +63,7 @@ class SQLAlchemyHealthCheck(AbstractHealthCheck):
         """
         async with self.session_maker() as session:  # pragma: no cover
             return (  # type:ignore[no-any-return]
-                await session.execute(text("SELECT 1"))
+                await session.execute(SELECT_ONE)
             ).scalar_one() == 1
 
 
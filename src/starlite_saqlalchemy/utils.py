@@ -8,12 +8,24 @@ def case_insensitive_string_compare(a: str, b: str, /) -> bool:
     return a.strip().lower() == b.strip().lower()
 
 
+_dataclass_field_names: dict[type, tuple[str, ...]] = {}
+
+
 def dataclass_as_dict_shallow(dataclass: Any, *, exclude_none: bool = False) -> dict[str, Any]:
-    """Convert a dataclass to dict, without deepcopy."""
+    """Convert a dataclass to dict, without deepcopy.
+
+    Field names are resolved once per dataclass type.
+    """
+    dataclass_type = type(dataclass)
+    try:
+        field_names = _dataclass_field_names[dataclass_type]
+    except KeyError:
+        field_names = tuple(field.name for field in dataclasses.fields(dataclass))
+        _dataclass_field_names[dataclass_type] = field_names
     ret: dict[str, Any] = {}
-    for field in dataclasses.fields(dataclass):
-        value = getattr(dataclass, field.name)
+    for name in field_names:
+        value = getattr(dataclass, name)
         if exclude_none and value is None:
             continue
-        ret[field.name] = value
+        ret[name] = value
     return ret
@@ -3,19 +3,23 @@ from __future__ import annotations
 
 import asyncio
 import dataclasses
-import inspect
+import importlib
 import logging
-from functools import partial
-from typing import TYPE_CHECKING, Any
+import multiprocessing
+import warnings
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from functools import cache, partial
+from typing import TYPE_CHECKING, Any, Literal
 
 import msgspec
 import saq
-from starlite.utils.serialization import default_serializer
+from saq.utils import now
 
 from starlite_saqlalchemy import constants, redis, settings, type_encoders, utils
 
 if TYPE_CHECKING:
-    from collections.abc import Awaitable, Callable, Collection
+    from collections.abc import Awaitable, Callable, Collection, Iterable
     from signal import Signals
 
     from saq.types import Context
@@ -27,23 +31,64 @@ __all__ = [
     "Queue",
     "Worker",
     "create_worker_instance",
-    "default_job_config_dict",
+    "get_default_job_config_dict",
     "make_service_callback",
     "enqueue_background_task_for_service",
-    "queue",
+    "enqueue_background_tasks_for_service",
+    "get_queue",
 ]
 
 logger = logging.getLogger(__name__)
 
-encoder = msgspec.json.Encoder(
-    enc_hook=partial(default_serializer, type_encoders=type_encoders.type_encoders_map)
-)
+_type_encoders: dict[type, Callable[[Any], Any]] = {}
+"""Encoder resolved for each type seen by `_enc_hook()`."""
+
+
+def _enc_hook(value: Any) -> Any:
+    """Encode types that `msgspec` doesn't support natively.
+
+    Resolves the encoder for the type of `value` from
+    [`type_encoders_map`][starlite_saqlalchemy.type_encoders.type_encoders_map] by walking its MRO,
+    the same as starlite's `default_serializer()`, but only once per type.
+    """
+    value_type = type(value)
+    try:
+        type_encoder = _type_encoders[value_type]
+    except KeyError:
+        for base in value_type.__mro__[:-1]:
+            if base in type_encoders.type_encoders_map:
+                type_encoder = _type_encoders[value_type] = type_encoders.type_encoders_map[base]
+                break
+        else:
+            raise TypeError(f"Unsupported type: {value_type!r}") from None
+    return type_encoder(value)
+
+
+encoder = msgspec.json.Encoder(enc_hook=_enc_hook)
+decoder = msgspec.json.Decoder(dict[str, Any])
+
+# same script that `saq.Queue.enqueue()` registers, so that either path can register it
+_ENQUEUE_SCRIPT = """
+if not redis.call('ZSCORE', KEYS[1], KEYS[2]) and redis.call('EXISTS', KEYS[4]) == 0 then
+    redis.call('SET', KEYS[2], ARGV[1])
+    redis.call('ZADD', KEYS[1], ARGV[2], KEYS[2])
+    if ARGV[2] == '0' then redis.call('RPUSH', KEYS[3], KEYS[2]) end
+    return 1
+else
+    return nil
+end
+"""
 
 
 class Queue(saq.Queue):
     """Async task queue."""
 
-    def __init__(self, *args: Any, **kwargs: Any) -> None:
+    def __init__(
+        self,
+        *args: Any,
+        batch_max_size: int = settings.worker.ENQUEUE_BATCH_MAX_SIZE,
+        **kwargs: Any,
+    ) -> None:
         """Create an SAQ Queue.
 
         See: https://github.com/tobymao/saq/blob/master/saq/queue.py
@@ -55,12 +100,19 @@ class Queue(saq.Queue):
 
         Args:
             *args: Passed through to `saq.Queue.__init__()`
+            batch_max_size: Max jobs written per pipeline when coalescing concurrent calls to
+                `enqueue()`. `0`, or less, to disable.
             **kwargs: Passed through to `saq.Queue.__init__()`
         """
         kwargs.setdefault("name", "background-worker")
         kwargs.setdefault("dump", encoder.encode)
-        kwargs.setdefault("load", msgspec.json.decode)
+        kwargs.setdefault("load", decoder.decode)
         super().__init__(*args, **kwargs)
+        self.batch_max_size = batch_max_size
+        self._batch_buf: list[tuple[saq.Job, asyncio.Future[saq.Job | None]]] = []
+        self._flush_inflight = False
+        self._flush_task: asyncio.Task[None] | None = None
+        self._write_task: asyncio.Task[Any] | None = None
 
     def namespace(self, key: str) -> str:
         """Namespace for the Queue.
@@ -73,6 +125,153 @@ class Queue(saq.Queue):
         """
         return f"{settings.app.slug}:{self.name}:{key}"
 
+    async def enqueue(self, job_or_func: str | saq.Job, **kwargs: Any) -> saq.Job | None:
+        """Enqueue a job, coalescing concurrent calls into pipelined writes.
+
+        While a job is being written to redis, jobs enqueued concurrently are buffered and written
+        together in a single pipeline once it completes, so concurrent producers share round trips.
+        Each caller receives the outcome of its own job.
+
+        Jobs given by function name or with `kwargs` go straight through to
+        `saq.Queue.enqueue()`, as do jobs enqueued by the task doing the write, e.g., from a
+        `before_enqueue` hook, as that write can't complete until they do.
+
+        Args:
+            job_or_func: Job, or name of the function to create a job for.
+            **kwargs: Job properties, or arguments for the function.
+
+        Returns:
+            The enqueued job, or `None` if the job had already been enqueued.
+        """
+        task = asyncio.current_task()
+        if (
+            kwargs
+            or isinstance(job_or_func, str)
+            or self.batch_max_size <= 0
+            or task is self._write_task
+            or task is self._flush_task
+        ):
+            return await super().enqueue(job_or_func, **kwargs)
+        if self._flush_inflight:
+            # raise to this caller now, rather than from the batch the job would be written with
+            self._check_queue(job_or_func)
+            future: asyncio.Future[saq.Job | None] = asyncio.get_running_loop().create_future()
+            self._batch_buf.append((job_or_func, future))
+            return await future
+        self._flush_inflight = True
+        self._write_task = task
+        try:
+            return await super().enqueue(job_or_func)
+        finally:
+            self._write_task = None
+            if self._batch_buf:
+                self._flush_task = asyncio.create_task(self._flush())
+            else:
+                self._flush_inflight = False
+
+    async def _flush(self) -> None:
+        """Write buffered jobs in batches of up to `batch_max_size` until the buffer is empty."""
+        try:
+            while self._batch_buf:
+                batch = self._batch_buf[: self.batch_max_size]
+                del self._batch_buf[: len(batch)]
+                await self._enqueue_batch(batch)
+        finally:
+            self._flush_inflight = False
+            self._flush_task = None
+
+    async def _enqueue_batch(
+        self, batch: list[tuple[saq.Job, asyncio.Future[saq.Job | None]]]
+    ) -> None:
+        """Write `batch` in a single pipeline, settling the future of each job individually.
+
+        A job whose `before_enqueue` hook, or script call, fails doesn't prevent the rest of the
+        batch from being written.
+        """
+        prepared: list[tuple[saq.Job, asyncio.Future[saq.Job | None]]] = []
+        for job, future in batch:
+            try:
+                await self._prepare_enqueue(job)
+            except Exception as exc:  # pylint: disable=broad-except
+                if not future.done():
+                    future.set_exception(exc)
+            else:
+                prepared.append((job, future))
+        if not prepared:
+            return
+        try:
+            async with self._op_sem, self.redis.pipeline(transaction=False) as pipe:
+                for job, _ in prepared:
+                    await self._pipeline_enqueue(pipe, job)
+                results = await pipe.execute(raise_on_error=False)
+        except Exception as exc:  # pylint: disable=broad-except
+            for _, future in prepared:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        for (job, future), result in zip(prepared, results):
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(self._enqueued(job, result))
+
+    async def enqueue_many(self, jobs: Iterable[saq.Job]) -> list[saq.Job | None]:
+        """Enqueue `jobs` in a single round trip to redis.
+
+        Each job goes through the same script as `saq.Queue.enqueue()`, but the calls are
+        pipelined, rather than awaited one at a time.
+
+        Args:
+            jobs: Jobs to be enqueued.
+
+        Returns:
+            The enqueued jobs, in order. Jobs that had already been enqueued are `None`.
+        """
+        jobs = list(jobs)
+        if not jobs:
+            return []
+        # checked up front, so that no job is modified if any of them can't be enqueued
+        for job in jobs:
+            self._check_queue(job)
+        # hooks run before the pipeline is opened, so they can enqueue jobs of their own
+        for job in jobs:
+            await self._prepare_enqueue(job)
+        async with self._op_sem, self.redis.pipeline(transaction=False) as pipe:
+            for job in jobs:
+                await self._pipeline_enqueue(pipe, job)
+            results = await pipe.execute()
+        return [self._enqueued(job, result) for job, result in zip(jobs, results)]
+
+    def _check_queue(self, job: saq.Job) -> None:
+        if job.queue and job.queue.name != self.name:
+            raise ValueError(f"Job {job} registered to a different queue")
+
+    async def _prepare_enqueue(self, job: saq.Job) -> None:
+        """Mark `job` queued and run `before_enqueue` hooks, as `saq.Queue.enqueue()` does."""
+        job.queue = self
+        job.queued = now()
+        job.status = saq.Status.QUEUED
+        await self._before_enqueue(job)
+
+    async def _pipeline_enqueue(self, pipe: Any, job: saq.Job) -> None:
+        """Queue the enqueue script call for `job` on `pipe`, as `saq.Queue.enqueue()` does."""
+        if not self._enqueue_script:
+            self._enqueue_script = self.redis.register_script(_ENQUEUE_SCRIPT)
+        await self._enqueue_script(
+            keys=[self._incomplete, job.id, self._queued, job.abort_id],
+            args=[self.serialize(job), job.scheduled],
+            client=pipe,
+        )
+
+    @staticmethod
+    def _enqueued(job: saq.Job, result: Any) -> saq.Job | None:
+        if not result:
+            return None
+        logger.info("Enqueuing %s", job)
+        return job
+
 
 class Worker(saq.Worker):
     """Modify behavior of saq worker for orchestration by Starlite."""
@@ -80,31 +279,56 @@ class Worker(saq.Worker):
     # same issue: https://github.com/samuelcolvin/arq/issues/182
     SIGNALS: list[Signals] = []
 
+    _start_task: asyncio.Task[None] | None = None
+
     async def on_app_startup(self) -> None:  # pragma: no cover
-        """Attach the worker to the running event loop."""
+        """Attach the worker to the running event loop.
+
+        A reference to the task is held, so it can't be garbage collected while the worker runs,
+        and if it fails, the error is logged as it happens rather than when the task is collected.
+        """
         loop = asyncio.get_running_loop()
-        loop.create_task(self.start())
+        self._start_task = loop.create_task(self.start())
+        self._start_task.add_done_callback(_log_worker_task_error)
 
+    async def stop(self) -> None:  # pragma: no cover
+        """Stop the worker, and shut down the process pool for service callbacks if created."""
+        await super().stop()
+        _shutdown_process_pool()
 
-queue = Queue(redis.client)
-"""Async worker queue.
 
-[Queue][starlite_saqlalchemy.worker.Queue] instance instantiated with
-[redis][starlite_saqlalchemy.redis.client] instance.
-"""
+def _log_worker_task_error(task: asyncio.Task[None]) -> None:
+    if not task.cancelled() and (exc := task.exception()) is not None:
+        logger.error("Worker stopped with an error", exc_info=exc)
+
+
+@cache
+def get_queue() -> Queue:
+    """Get the async worker queue.
 
+    Created on first call, so importing this module doesn't construct a queue.
+
+    Returns:
+        [Queue][starlite_saqlalchemy.worker.Queue] instance instantiated with
+        [redis][starlite_saqlalchemy.redis.client] instance.
+    """
+    return Queue(redis.client)
 
-@dataclasses.dataclass()
+
+@dataclasses.dataclass(frozen=True)
 class JobConfig:
     """Configure a Job.
 
     Used to configure jobs enqueued via
     `Service.enqueue_background_task()`
+
+    Instances are immutable, as their job properties are read once, the first time they are used to
+    enqueue a job.
     """
 
     # pylint:disable=too-many-instance-attributes
 
-    queue: Queue = queue
+    queue: Queue = dataclasses.field(default_factory=get_queue)
     """Queue associated with the job."""
     key: str | None = None
     """Pass in to control duplicate jobs."""
@@ -136,9 +360,66 @@ class JobConfig:
     - This always includes jitter, where the final retry delay is a random number between 0 and the calculated retry delay.
     - If retry_backoff is set to a number, that number is the maximum retry delay, in seconds."
     """
+    run_in: Literal["async", "process"] = "async"
+    """Where the service method is called.
+
+    - `"async"`: on the worker's event loop.
+    - `"process"`: in a separate process, for CPU-bound work that would otherwise block the loop,
+        and all other jobs, while it runs. The service method is called on a new instance of the
+        service, created in the child process, on an event loop of its own. Its arguments must be
+        picklable.
+
+        If the job is cancelled, e.g., as it timed out, or was aborted, the worker stops waiting
+        for the method, but it can't be interrupted in the child process and runs to completion.
+        So a retry of the job can run at the same time as the original call.
+    """
+
+
+def _job_properties(job_config: JobConfig) -> dict[str, Any]:
+    job_config_dict = utils.dataclass_as_dict_shallow(job_config, exclude_none=True)
+    # not a property of `saq.Job`, it is passed to the callback instead
+    del job_config_dict["run_in"]
+    return job_config_dict
+
+
+@cache
+def get_default_job_config_dict() -> dict[str, Any]:
+    """Get the job properties used when no `JobConfig` is given.
+
+    Returns:
+        Job properties of a default [`JobConfig`][starlite_saqlalchemy.worker.JobConfig].
+    """
+    return _job_properties(JobConfig())
+
+
+_DEPRECATED_ATTRS: dict[str, Callable[[], Any]] = {
+    "queue": get_queue,
+    "default_job_config_dict": get_default_job_config_dict,
+}
+"""Module attributes that are now built on first use, and the functions that build them."""
+
+
+def __getattr__(name: str) -> Any:
+    """Keep the module attributes replaced by getter functions available, with a warning."""
+    try:
+        getter = _DEPRECATED_ATTRS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    warnings.warn(
+        f"`{__name__}.{name}` is deprecated, use `{__name__}.{getter.__name__}()` instead",
+        DeprecationWarning,
+        stacklevel=2,
+    )
+    return getter()
 
 
-default_job_config_dict = utils.dataclass_as_dict_shallow(JobConfig(), exclude_none=True)
+_job_config_dicts: dict[int, dict[str, Any]] = {}
+"""Job config dicts, keyed by `id()` of the [`JobConfig`][starlite_saqlalchemy.worker.JobConfig]
+they were built from.
+
+Entries are evicted when the `JobConfig` is garbage collected, so an id can't be reused while it is
+cached.
+"""
 
 
 def create_worker_instance(
@@ -156,11 +437,65 @@ def create_worker_instance(
     Returns:
         The worker instance, instantiated with `functions`.
     """
-    return Worker(queue, functions, before_process=before_process, after_process=after_process)
+    return Worker(
+        get_queue(), functions, before_process=before_process, after_process=after_process
+    )
+
+
+@cache
+def _get_process_pool() -> ProcessPoolExecutor:
+    # spawn, so that children don't inherit the event loop, or connections, of the worker
+    return ProcessPoolExecutor(
+        mp_context=multiprocessing.get_context("spawn"), initializer=_init_process
+    )
+
+
+def _shutdown_process_pool() -> None:
+    # don't create a pool just to shut it down
+    if _get_process_pool.cache_info().currsize:
+        _get_process_pool().shutdown(wait=False, cancel_futures=True)
+        _get_process_pool.cache_clear()
+
+
+def _init_process() -> None:
+    """Set the event loop that service callbacks run on in a process pool child.
+
+    The loop lives as long as the child, as pooled connections, e.g., of `db.engine` and
+    `redis.client`, are bound to the loop that they were opened on.
+    """
+    asyncio.set_event_loop(asyncio.new_event_loop())
+
+
+async def _call_service_method(
+    service_type_id: str, service_method_name: str, kwargs: dict[str, Any]
+) -> None:
+    service_type = constants.SERVICE_OBJECT_IDENTITY_MAP[service_type_id]
+    async with service_type.new() as service_object:
+        method = getattr(service_object, service_method_name)
+        await method(**kwargs)
+
+
+def _call_service_method_in_process(
+    service_type_id: str, service_method_name: str, kwargs: dict[str, Any]
+) -> None:
+    """Entrypoint of service callbacks run in the process pool.
+
+    Importing the module of the service type registers it in the child process. The method is
+    called on the event loop set by `_init_process()`, shared by all callbacks in the child.
+    """
+    importlib.import_module(service_type_id.rpartition(".")[0])
+    asyncio.get_event_loop().run_until_complete(
+        _call_service_method(service_type_id, service_method_name, kwargs)
+    )
 
 
 async def make_service_callback(
-    _ctx: Context, *, service_type_id: str, service_method_name: str, **kwargs: Any
+    _ctx: Context,
+    *,
+    service_type_id: str,
+    service_method_name: str,
+    service_run_in: Literal["async", "process"] = "async",
+    **kwargs: Any,
 ) -> None:
     """Make an async service callback.
 
@@ -168,12 +503,51 @@ async def make_service_callback(
         _ctx: the SAQ context
         service_type_id: Value of `__id__` class var on service type.
         service_method_name: Method to be called on the service object.
+        service_run_in: Where the method is called, see
+            [`JobConfig.run_in`][starlite_saqlalchemy.worker.JobConfig.run_in].
         **kwargs: Unpacked into the service method call as keyword arguments.
     """
-    service_type = constants.SERVICE_OBJECT_IDENTITY_MAP[service_type_id]
-    async with service_type.new() as service_object:
-        method = getattr(service_object, service_method_name)
-        await method(**kwargs)
+    if service_run_in == "process":
+        await asyncio.get_running_loop().run_in_executor(
+            _get_process_pool(),
+            _call_service_method_in_process,
+            service_type_id,
+            service_method_name,
+            kwargs,
+        )
+    else:
+        await _call_service_method(service_type_id, service_method_name, kwargs)
+
+
+_CALLBACK_FN_NAME = make_service_callback.__qualname__
+_make_callback_job = partial(saq.Job, function=_CALLBACK_FN_NAME)
+
+
+def _make_service_job(
+    service_obj: Service,
+    method_name: str,
+    job_config: JobConfig | None,
+    job_config_dict: dict[str, Any],
+    kwargs: dict[str, Any],
+) -> saq.Job:
+    kwargs["service_type_id"] = service_obj.__id__
+    kwargs["service_method_name"] = method_name
+    if job_config is not None and job_config.run_in != "async":
+        kwargs["service_run_in"] = job_config.run_in
+    return _make_callback_job(kwargs=kwargs, **job_config_dict)
+
+
+def _job_config_dict(job_config: JobConfig | None) -> dict[str, Any]:
+    if job_config is None:
+        return get_default_job_config_dict()
+    key = id(job_config)
+    try:
+        return _job_config_dicts[key]
+    except KeyError:
+        job_config_dict = _job_properties(job_config)
+        _job_config_dicts[key] = job_config_dict
+        weakref.finalize(job_config, _job_config_dicts.pop, key, None)
+        return job_config_dict
 
 
 async def enqueue_background_task_for_service(
@@ -187,21 +561,31 @@ async def enqueue_background_task_for_service(
         job_config: Configuration object to control the job that is enqueued.
         **kwargs: Arguments to be passed to the method when called. Must be JSON serializable.
     """
-    module = inspect.getmodule(service_obj)
-    if module is None:  # pragma: no cover
-        logger.warning("Callback not enqueued, no module resolved for %s", service_obj)
-        return
-    job_config_dict: dict[str, Any]
-    if job_config is None:
-        job_config_dict = default_job_config_dict
-    else:
-        job_config_dict = utils.dataclass_as_dict_shallow(job_config, exclude_none=True)
+    logger.debug("Enqueuing callback %s.%s", service_obj.__id__, method_name)
+    job = _make_service_job(
+        service_obj, method_name, job_config, _job_config_dict(job_config), kwargs
+    )
+    await get_queue().enqueue(job)
 
-    kwargs["service_type_id"] = service_obj.__id__
-    kwargs["service_method_name"] = method_name
-    job = saq.Job(
-        function=make_service_callback.__qualname__,
-        kwargs=kwargs,
-        **job_config_dict,
+
+async def enqueue_background_tasks_for_service(
+    service_obj: Service,
+    calls: Iterable[tuple[str, dict[str, Any]]],
+    job_config: JobConfig | None = None,
+) -> None:
+    """Enqueue an async callback for each of `calls` in a single round trip to redis.
+
+    Args:
+        service_obj: The Service instance that is requesting the callbacks.
+        calls: Pairs of the method on the service object that should be called by the async
+            worker, and the arguments to be passed to it. Arguments must be JSON serializable.
+        job_config: Configuration object to control the jobs that are enqueued.
+    """
+    logger.debug("Enqueuing callbacks for %s", service_obj.__id__)
+    job_config_dict = _job_config_dict(job_config)
+    await get_queue().enqueue_many(
+        [
+            _make_service_job(service_obj, method_name, job_config, job_config_dict, dict(kwargs))
+            for method_name, kwargs in calls
+        ]
     )
-    await queue.enqueue(job)
@@ -207,7 +207,7 @@ def _patch_db(app: Starlite, engine: AsyncEngine, monkeypatch: pytest.MonkeyPatc
 @pytest.fixture(autouse=True)
 def _patch_redis(app: Starlite, redis: Redis, monkeypatch: pytest.MonkeyPatch) -> None:
     monkeypatch.setattr(app.cache, "backend", redis)
-    monkeypatch.setattr(worker.queue, "redis", redis)
+    monkeypatch.setattr(worker.get_queue(), "redis", redis)
 
 
 @pytest.fixture(name="client")
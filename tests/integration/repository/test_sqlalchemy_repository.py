@@ -1,8 +1,10 @@
 import pytest
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+from sqlalchemy.orm import subqueryload
 
 from starlite_saqlalchemy.exceptions import StarliteSaqlalchemyError
-from tests.utils.domain import authors
+from tests.utils.domain import authors, books
 
 
 @pytest.fixture(name="session")
@@ -18,3 +20,10 @@ def fx_repo(session: AsyncSession) -> authors.Repository:
 def test_filter_by_kwargs_with_incorrect_attribute_name(repo: authors.Repository) -> None:
     with pytest.raises(StarliteSaqlalchemyError):
         repo.filter_collection_by_kwargs(whoops="silly me")
+
+
+async def test_list_with_subqueryload(session: AsyncSession) -> None:
+    repo = books.Repository(
+        session=session, select_=select(books.Book).options(subqueryload(books.Book.author))
+    )
+    assert await repo.list() == []
@@ -1,15 +1,22 @@
 """Tests for the SAQ async worker functionality."""
+# pylint: disable=protected-access
 from __future__ import annotations
 
+import asyncio
+import dataclasses
+import gc
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from typing import TYPE_CHECKING, Any
-from unittest.mock import AsyncMock
+from unittest.mock import DEFAULT, AsyncMock, MagicMock
 
 import pytest
+import saq
 from asyncpg.pgproto import pgproto
 from pydantic import BaseModel
-from saq import Job
+from saq import Job, Status
 
-from starlite_saqlalchemy import service, worker
+from starlite_saqlalchemy import service, type_encoders, worker
 
 if TYPE_CHECKING:
     from pytest import MonkeyPatch
@@ -35,6 +42,35 @@ def test_worker_decoder_handles_pydantic_models() -> None:
     assert encoded == b'{"a":"a","b":1,"c":2.34}'
 
 
+def test_worker_encoder_resolves_type_encoder_once() -> None:
+    """Test that the type encoder for a subclass is found via its MRO, and
+    remembered."""
+
+    class Model(BaseModel):
+        a: str
+
+    assert worker.encoder.encode(Model(a="a")) == b'{"a":"a"}'
+    assert worker._type_encoders[Model] is type_encoders.type_encoders_map[BaseModel]
+
+
+def test_worker_encoder_raises_for_unsupported_type() -> None:
+    """Test that types without an encoder aren't silently encoded."""
+    with pytest.raises(TypeError):
+        worker.encoder.encode(object())
+
+
+def test_queue_job_round_trip(job: Job) -> None:
+    """Test that a job survives serialization by the queue's `dump` and
+    `load`."""
+    queue = worker.Queue(MagicMock())
+    job.queue = queue
+    deserialized = queue.deserialize(queue.serialize(job))  # type:ignore[arg-type]
+    assert deserialized is not None
+    assert deserialized.function == job.function
+    assert deserialized.kwargs == job.kwargs
+    assert deserialized.queue is queue
+
+
 async def test_make_service_callback(
     raw_authors: list[dict[str, Any]], monkeypatch: MonkeyPatch
 ) -> None:
@@ -63,10 +99,93 @@ async def test_make_service_callback_raises_runtime_error(
         )
 
 
+async def test_make_service_callback_in_process(monkeypatch: MonkeyPatch) -> None:
+    """Tests that `run_in="process"` calls the service method through the
+    process pool."""
+    call_mock = MagicMock()
+    monkeypatch.setattr(worker, "_call_service_method_in_process", call_mock)
+    with ThreadPoolExecutor() as executor:
+        monkeypatch.setattr(worker, "_get_process_pool", lambda: executor)
+        await worker.make_service_callback(
+            {},
+            service_type_id="tests.utils.domain.authors.Service",
+            service_method_name="receive_callback",
+            service_run_in="process",
+            raw_obj={"a": "b"},
+        )
+    call_mock.assert_called_once_with(
+        "tests.utils.domain.authors.Service", "receive_callback", {"raw_obj": {"a": "b"}}
+    )
+
+
+async def test_make_service_callback_passes_run_in_kwarg(monkeypatch: MonkeyPatch) -> None:
+    """Tests that a service method argument named `run_in` isn't consumed by
+    the callback."""
+    recv_cb_mock = AsyncMock()
+    monkeypatch.setattr(service.Service, "receive_callback", recv_cb_mock, raising=False)
+    await worker.make_service_callback(
+        {},
+        service_type_id="tests.utils.domain.authors.Service",
+        service_method_name="receive_callback",
+        run_in="somewhere",
+    )
+    recv_cb_mock.assert_awaited_once_with(run_in="somewhere")
+
+
+def test_shutdown_process_pool() -> None:
+    """Tests that the process pool is shut down, if it was created, and that
+    a later callback gets a new one."""
+    worker._shutdown_process_pool()
+    assert worker._get_process_pool.cache_info().currsize == 0
+    pool = worker._get_process_pool()
+    worker._shutdown_process_pool()
+    assert worker._get_process_pool.cache_info().currsize == 0
+    with pytest.raises(RuntimeError):
+        pool.submit(print)
+    assert worker._get_process_pool() is not pool
+    worker._shutdown_process_pool()
+
+
+class LoopCheckingService(service.Service[Any]):
+    """Service with a callback that fails unless every call in a process is
+    on the same event loop."""
+
+    loop: asyncio.AbstractEventLoop | None = None
+
+    async def check_loop(self) -> None:
+        """Raise if called on a different loop to the first call in this
+        process."""
+        loop = asyncio.get_running_loop()
+        if LoopCheckingService.loop is None:
+            LoopCheckingService.loop = loop
+        if loop is not LoopCheckingService.loop:
+            raise RuntimeError("Called on a different event loop")
+
+
+async def test_make_service_callback_in_process_pool_reuses_loop(
+    monkeypatch: MonkeyPatch,
+) -> None:
+    """Tests that callbacks run in the same child of a real process pool share
+    an event loop, so loop-bound connection pools stay usable."""
+    with ProcessPoolExecutor(
+        max_workers=1,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=worker._init_process,
+    ) as executor:
+        monkeypatch.setattr(worker, "_get_process_pool", lambda: executor)
+        for _ in range(2):
+            await worker.make_service_callback(
+                {},
+                service_type_id=LoopCheckingService.__id__,
+                service_method_name="check_loop",
+                service_run_in="process",
+            )
+
+
 async def test_enqueue_service_callback(monkeypatch: "MonkeyPatch") -> None:
     """Tests that job enqueued with desired arguments."""
     enqueue_mock = AsyncMock()
-    monkeypatch.setattr(worker.queue, "enqueue", enqueue_mock)
+    monkeypatch.setattr(worker.get_queue(), "enqueue", enqueue_mock)
     service_instance = service.Service[Any]()
     await worker.enqueue_background_task_for_service(
         service_instance, "receive_callback", raw_obj={"a": "b"}
@@ -85,7 +204,7 @@ async def test_enqueue_service_callback(monkeypatch: "MonkeyPatch") -> None:
 async def test_enqueue_service_callback_with_custom_job_config(monkeypatch: "MonkeyPatch") -> None:
     """Tests that job enqueued with desired arguments."""
     enqueue_mock = AsyncMock()
-    monkeypatch.setattr(worker.queue, "enqueue", enqueue_mock)
+    monkeypatch.setattr(worker.get_queue(), "enqueue", enqueue_mock)
     service_instance = service.Service[Any]()
     await worker.enqueue_background_task_for_service(
         service_instance,
@@ -103,3 +222,311 @@ async def test_enqueue_service_callback_with_custom_job_config(monkeypatch: "Mon
         "service_method_name": "receive_callback",
         "raw_obj": {"a": "b"},
     }
+
+
+def test_get_queue_returns_same_instance() -> None:
+    """Tests that a single queue is shared by jobs and the worker."""
+    assert worker.get_queue() is worker.get_queue()
+    assert worker.JobConfig().queue is worker.get_queue()
+    assert worker.create_worker_instance([]).queue is worker.get_queue()
+
+
+@pytest.mark.parametrize(
+    ("name", "getter"),
+    [("queue", "get_queue"), ("default_job_config_dict", "get_default_job_config_dict")],
+)
+def test_deprecated_module_attributes(name: str, getter: str) -> None:
+    """Tests that the module attributes replaced by getters still resolve,
+    with a warning."""
+    with pytest.warns(DeprecationWarning, match=f"use `.*{getter}\\(\\)` instead"):
+        value = getattr(worker, name)
+    assert value is getattr(worker, getter)()
+
+
+def test_unknown_module_attribute() -> None:
+    """Tests that other missing module attributes still raise."""
+    with pytest.raises(AttributeError):
+        worker.whoops  # type:ignore[attr-defined]  # pylint: disable=pointless-statement
+
+
+def test_job_config_dict_cached_per_instance() -> None:
+    """Tests that the job properties of a `JobConfig` are read once, and
+    evicted with it."""
+    job_config = worker.JobConfig(timeout=999)
+    job_config_dict = worker._job_config_dict(job_config)
+    assert job_config_dict["timeout"] == 999
+    assert worker._job_config_dict(job_config) is job_config_dict
+    key = id(job_config)
+    del job_config
+    gc.collect()
+    assert key not in worker._job_config_dicts
+
+
+def test_job_config_is_immutable() -> None:
+    """Tests that a `JobConfig` can't be modified after its job properties
+    are cached."""
+    job_config = worker.JobConfig()
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        job_config.timeout = 999  # type:ignore[misc]
+
+
+async def test_enqueue_service_callback_in_process(monkeypatch: MonkeyPatch) -> None:
+    """Tests that `run_in` is passed to the callback, rather than to the
+    job."""
+    enqueue_mock = AsyncMock()
+    monkeypatch.setattr(worker.get_queue(), "enqueue", enqueue_mock)
+    await worker.enqueue_background_task_for_service(
+        service.Service[Any](), "receive_callback", job_config=worker.JobConfig(run_in="process")
+    )
+    job = enqueue_mock.mock_calls[0].args[0]
+    assert job.kwargs["service_run_in"] == "process"
+    assert "run_in" not in worker.get_default_job_config_dict()
+
+
+async def test_enqueue_service_callbacks(monkeypatch: "MonkeyPatch") -> None:
+    """Tests that a job is enqueued for each call, through a single
+    `enqueue_many()`."""
+    enqueue_many_mock = AsyncMock()
+    monkeypatch.setattr(worker.get_queue(), "enqueue_many", enqueue_many_mock)
+    service_instance = service.Service[Any]()
+    await worker.enqueue_background_tasks_for_service(
+        service_instance,
+        [("receive_callback", {"raw_obj": {"a": "b"}}), ("receive_callback", {"raw_obj": {}})],
+        job_config=worker.JobConfig(timeout=999),
+    )
+    enqueue_many_mock.assert_called_once()
+    jobs = enqueue_many_mock.mock_calls[0].args[0]
+    assert [job.kwargs["raw_obj"] for job in jobs] == [{"a": "b"}, {}]
+    for job in jobs:
+        assert job.function == worker.make_service_callback.__qualname__
+        assert job.timeout == 999
+        assert job.kwargs["service_type_id"] == "starlite_saqlalchemy.service.generic.Service"
+        assert job.kwargs["service_method_name"] == "receive_callback"
+
+
+async def test_queue_enqueue_many() -> None:
+    """Tests that jobs are enqueued through a single pipeline."""
+    redis_mock = MagicMock()
+    pipe = redis_mock.pipeline.return_value.__aenter__.return_value
+    pipe.execute = AsyncMock(return_value=[1, None])
+    script_mock = AsyncMock()
+    redis_mock.register_script.return_value = script_mock
+    queue = worker.Queue(redis_mock)
+    jobs = [Job("a"), Job("b")]
+    assert await queue.enqueue_many(jobs) == [jobs[0], None]
+    redis_mock.pipeline.assert_called_once_with(transaction=False)
+    pipe.execute.assert_awaited_once()
+    assert script_mock.await_count == 2
+    for job, script_call in zip(jobs, script_mock.await_args_list):
+        assert job.queue is queue
+        assert job.status == Status.QUEUED
+        assert script_call.kwargs["client"] is pipe
+        assert script_call.kwargs["args"] == [queue.serialize(job), job.scheduled]
+
+
+async def test_queue_enqueue_many_different_queue() -> None:
+    """Tests that no job is modified, or written, if any is registered to
+    another queue."""
+    redis_mock = MagicMock()
+    queue = worker.Queue(redis_mock)
+    jobs = [Job("a"), Job("b", queue=worker.Queue(redis_mock, name="other"))]
+    with pytest.raises(ValueError, match="registered to a different queue"):
+        await queue.enqueue_many(jobs)
+    assert jobs[0].queue is None
+    assert jobs[0].status == Status.NEW
+    redis_mock.pipeline.assert_not_called()
+
+
+async def test_queue_enqueue_many_no_jobs() -> None:
+    """Tests that we don't talk to redis if there is nothing to enqueue."""
+    redis_mock = MagicMock()
+    queue = worker.Queue(redis_mock)
+    assert await queue.enqueue_many([]) == []
+    redis_mock.pipeline.assert_not_called()
+
+
+@pytest.fixture()
+def held_enqueue(monkeypatch: MonkeyPatch) -> asyncio.Event:
+    """Hold calls to `saq.Queue.enqueue()` until the returned event is set."""
+    release = asyncio.Event()
+
+    async def enqueue(_: saq.Queue, job: Job) -> Job:
+        await release.wait()
+        return job
+
+    monkeypatch.setattr(saq.Queue, "enqueue", enqueue)
+    return release
+
+
+@pytest.fixture()
+def batches() -> list[list[str]]:
+    """Ids of the jobs written by each pipeline of `batch_redis`."""
+    return []
+
+
+@pytest.fixture()
+def batch_redis(batches: list[list[str]]) -> MagicMock:
+    """Redis mock that records the jobs written through each pipeline."""
+    redis_mock = MagicMock()
+
+    def pipeline(**_: Any) -> Any:
+        batches.append([])
+        return DEFAULT
+
+    async def enqueue_script(*, keys: list[str], **_: Any) -> None:
+        batches[-1].append(keys[1])
+
+    redis_mock.pipeline.side_effect = pipeline
+    redis_mock.register_script.return_value = enqueue_script
+    pipe = redis_mock.pipeline.return_value.__aenter__.return_value
+    pipe.execute = AsyncMock(side_effect=lambda **_: [1] * len(batches[-1]))
+    return redis_mock
+
+
+async def test_queue_enqueue_coalesces_concurrent_jobs(
+    held_enqueue: asyncio.Event, batch_redis: MagicMock, batches: list[list[str]]
+) -> None:
+    """Tests that jobs enqueued while another is in flight are written in
+    batches."""
+    queue = worker.Queue(batch_redis, batch_max_size=2)
+    jobs = [Job("a"), Job("b"), Job("c"), Job("d")]
+    tasks = [asyncio.create_task(queue.enqueue(job)) for job in jobs]
+    await asyncio.sleep(0)
+    held_enqueue.set()
+    assert await asyncio.gather(*tasks) == jobs
+    assert batches == [[job.id for job in jobs[1:3]], [jobs[3].id]]
+    assert queue._batch_buf == []
+    assert not queue._flush_inflight
+
+
+async def test_queue_enqueue_batch_failures_raised_to_own_caller(
+    held_enqueue: asyncio.Event, batch_redis: MagicMock, batches: list[list[str]]
+) -> None:
+    """Tests that a job that can't be enqueued fails only its own caller, and
+    doesn't stop the rest of its batch being written."""
+    queue = worker.Queue(batch_redis)
+
+    async def before_enqueue(job: Job) -> None:
+        if job.function == "hook_fails":
+            raise RuntimeError
+
+    queue.register_before_enqueue(before_enqueue)
+    other_queue = worker.Queue(batch_redis, name="other")
+    jobs = [Job("a"), Job("b"), Job("c", queue=other_queue), Job("hook_fails"), Job("d")]
+    tasks = [asyncio.create_task(queue.enqueue(job)) for job in jobs]
+    await asyncio.sleep(0)
+    held_enqueue.set()
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    assert results[:2] == jobs[:2]
+    assert isinstance(results[2], ValueError)
+    assert isinstance(results[3], RuntimeError)
+    assert results[4] is jobs[4]
+    assert batches == [[jobs[1].id, jobs[4].id]]
+    assert not queue._flush_inflight
+
+
+async def test_queue_enqueue_batch_command_error_raised_to_own_caller(
+    held_enqueue: asyncio.Event, batch_redis: MagicMock
+) -> None:
+    """Tests that an error returned by redis for one job of a batch is raised
+    to its caller only."""
+    pipe = batch_redis.pipeline.return_value.__aenter__.return_value
+    pipe.execute = AsyncMock(return_value=[1, RuntimeError(), None])
+    queue = worker.Queue(batch_redis)
+    jobs = [Job("a"), Job("b"), Job("c"), Job("d")]
+    tasks = [asyncio.create_task(queue.enqueue(job)) for job in jobs]
+    await asyncio.sleep(0)
+    held_enqueue.set()
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    assert results[:2] == jobs[:2]
+    assert isinstance(results[2], RuntimeError)
+    assert results[3] is None
+    pipe.execute.assert_awaited_once_with(raise_on_error=False)
+
+
+async def test_queue_enqueue_batch_error_raised_to_callers(
+    held_enqueue: asyncio.Event, batch_redis: MagicMock
+) -> None:
+    """Tests that each caller waiting on a batch that couldn't be written
+    receives the error."""
+    pipe = batch_redis.pipeline.return_value.__aenter__.return_value
+    pipe.execute = AsyncMock(side_effect=ConnectionError)
+    queue = worker.Queue(batch_redis)
+    jobs = [Job("a"), Job("b"), Job("c")]
+    tasks = [asyncio.create_task(queue.enqueue(job)) for job in jobs]
+    await asyncio.sleep(0)
+    held_enqueue.set()
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    assert results[0] is jobs[0]
+    assert all(isinstance(result, ConnectionError) for result in results[1:])
+    assert not queue._flush_inflight
+
+
+async def test_queue_enqueue_from_before_enqueue_hook() -> None:
+    """Tests that a `before_enqueue` hook of a job being written can enqueue
+    another job, rather than waiting on the write it is part of."""
+    redis_mock = MagicMock()
+    script_mock = AsyncMock(return_value=1)
+    redis_mock.register_script.return_value = script_mock
+    queue = worker.Queue(redis_mock)
+    child = Job("child")
+
+    async def before_enqueue(job: Job) -> None:
+        if job.function == "parent":
+            assert await queue.enqueue(child) is child
+
+    queue.register_before_enqueue(before_enqueue)
+    parent = Job("parent")
+    assert await asyncio.wait_for(queue.enqueue(parent), timeout=1) is parent
+    assert script_mock.await_count == 2
+    assert not queue._flush_inflight
+
+
+async def test_queue_enqueue_from_before_enqueue_hook_of_batch(
+    held_enqueue: asyncio.Event, batch_redis: MagicMock, batches: list[list[str]]
+) -> None:
+    """Tests that a `before_enqueue` hook of a buffered job can enqueue
+    another job, rather than waiting on the flush it is part of."""
+    queue = worker.Queue(batch_redis)
+    child = Job("child")
+
+    async def before_enqueue(job: Job) -> None:
+        if job.function == "parent":
+            assert await queue.enqueue(child) is child
+
+    queue.register_before_enqueue(before_enqueue)
+    jobs = [Job("a"), Job("parent")]
+    tasks = [asyncio.create_task(queue.enqueue(job)) for job in jobs]
+    await asyncio.sleep(0)
+    held_enqueue.set()
+    assert await asyncio.wait_for(asyncio.gather(*tasks), timeout=1) == jobs
+    assert batches == [[jobs[1].id]]
+    assert not queue._flush_inflight
+
+
+@pytest.mark.parametrize("batch_max_size", [0, -1])
+async def test_queue_enqueue_batching_disabled(
+    held_enqueue: asyncio.Event, batch_max_size: int
+) -> None:
+    """Tests that jobs aren't buffered if `batch_max_size` isn't positive."""
+    queue = worker.Queue(MagicMock(), batch_max_size=batch_max_size)
+    jobs = [Job("a"), Job("b")]
+    tasks = [asyncio.create_task(queue.enqueue(job)) for job in jobs]
+    await asyncio.sleep(0)
+    assert queue._batch_buf == []
+    held_enqueue.set()
+    assert await asyncio.gather(*tasks) == jobs
+
+
+async def test_worker_task_error_logged(caplog: pytest.LogCaptureFixture) -> None:
+    """Tests that the worker task failing is logged when it happens."""
+
+    async def fail() -> None:
+        raise RuntimeError("boom")
+
+    task = asyncio.create_task(fail())
+    task.add_done_callback(worker._log_worker_task_error)
+    with pytest.raises(RuntimeError):
+        await task
+    await asyncio.sleep(0)
+    assert "Worker stopped with an error" in caplog.text
@@ -5,12 +5,21 @@ from __future__ import annotations
 from datetime import datetime
 from typing import TYPE_CHECKING
 from unittest.mock import AsyncMock, MagicMock, call
+from uuid import uuid4
 
 import pytest
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import asyncpg
 from sqlalchemy.exc import IntegrityError, InvalidRequestError, SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import subqueryload
 
-from starlite_saqlalchemy.exceptions import ConflictError, StarliteSaqlalchemyError
+from starlite_saqlalchemy.exceptions import (
+    ConflictError,
+    NotFoundError,
+    StarliteSaqlalchemyError,
+)
+from starlite_saqlalchemy.repository import sqlalchemy as sqlalchemy_repository
 from starlite_saqlalchemy.repository.filters import (
     BeforeAfter,
     CollectionFilter,
@@ -20,6 +29,9 @@ from starlite_saqlalchemy.repository.sqlalchemy import (
     SQLAlchemyRepository,
     wrap_sqlalchemy_exception,
 )
+from tests.utils.domain.authors import Repository as AuthorRepository
+from tests.utils.domain.books import Book
+from tests.utils.domain.books import Repository as BookRepository
 
 if TYPE_CHECKING:
     from pytest import MonkeyPatch
@@ -49,9 +61,13 @@ def test_wrap_sqlalchemy_generic_error() -> None:
         raise SQLAlchemyError
 
 
-async def test_sqlalchemy_repo_add(mock_repo: SQLAlchemyRepository) -> None:
+async def test_sqlalchemy_repo_add(
+    mock_repo: SQLAlchemyRepository, monkeypatch: MonkeyPatch
+) -> None:
     """Test expected method calls for add operation."""
     mock_instance = MagicMock()
+    instance_state_mock = MagicMock(return_value=MagicMock(unloaded={"author"}))
+    monkeypatch.setattr(sqlalchemy_repository, "instance_state", instance_state_mock)
     instance = await mock_repo.add(mock_instance)
     assert instance is mock_instance
     mock_repo.session.add.assert_called_once_with(mock_instance)
@@ -61,6 +77,21 @@ async def test_sqlalchemy_repo_add(mock_repo: SQLAlchemyRepository) -> None:
     mock_repo.session.commit.assert_not_called()
 
 
+async def test_sqlalchemy_repo_add_skips_refresh_if_fully_loaded(
+    mock_repo: SQLAlchemyRepository, monkeypatch: MonkeyPatch
+) -> None:
+    """Test that add doesn't refresh an instance that was fully populated by
+    the flush."""
+    mock_instance = MagicMock()
+    instance_state_mock = MagicMock(return_value=MagicMock(unloaded=set()))
+    monkeypatch.setattr(sqlalchemy_repository, "instance_state", instance_state_mock)
+    instance = await mock_repo.add(mock_instance)
+    assert instance is mock_instance
+    mock_repo.session.flush.assert_called_once()
+    mock_repo.session.refresh.assert_not_called()
+    mock_repo.session.expunge.assert_called_once_with(mock_instance)
+
+
 async def test_sqlalchemy_repo_delete(
     mock_repo: SQLAlchemyRepository, monkeypatch: MonkeyPatch
 ) -> None:
@@ -75,75 +106,100 @@ async def test_sqlalchemy_repo_delete(
     mock_repo.session.commit.assert_not_called()
 
 
-async def test_sqlalchemy_repo_get_member(
-    mock_repo: SQLAlchemyRepository, monkeypatch: MonkeyPatch
-) -> None:
+async def test_sqlalchemy_repo_get_member(mock_repo: SQLAlchemyRepository) -> None:
     """Test expected method calls for member get operation."""
     mock_instance = MagicMock()
     result_mock = MagicMock()
     result_mock.scalar_one_or_none = MagicMock(return_value=mock_instance)
-    execute_mock = AsyncMock(return_value=result_mock)
-    monkeypatch.setattr(mock_repo, "_execute", execute_mock)
+    mock_repo.session.execute.return_value = result_mock
+    mock_repo.model_type.id.__eq__ = lambda self, other: f"id == {other}"
+    mock_repo._select.where.return_value = mock_repo._select
     instance = await mock_repo.get("instance-id")
     assert instance is mock_instance
+    mock_repo._select.where.assert_called_once_with("id == instance-id")
     mock_repo.session.expunge.assert_called_once_with(mock_instance)
     mock_repo.session.commit.assert_not_called()
 
 
-async def test_sqlalchemy_repo_list(
-    mock_repo: SQLAlchemyRepository, monkeypatch: MonkeyPatch
-) -> None:
+async def test_sqlalchemy_repo_list(mock_repo: SQLAlchemyRepository) -> None:
     """Test expected method calls for list operation."""
     mock_instances = [MagicMock(), MagicMock()]
     result_mock = MagicMock()
-    result_mock.scalars = MagicMock(return_value=mock_instances)
-    execute_mock = AsyncMock(return_value=result_mock)
-    monkeypatch.setattr(mock_repo, "_execute", execute_mock)
+    result_mock.scalars.return_value.all.return_value = mock_instances
+    mock_repo.session.execute.return_value = result_mock
     instances = await mock_repo.list()
-    assert instances == mock_instances
-    mock_repo.session.expunge.assert_has_calls(*mock_instances)
+    assert instances is mock_instances
+    mock_repo.session.execute.assert_called_once_with(mock_repo._select)
+    mock_repo.session.stream.assert_not_called()
+    mock_repo.session.expunge.assert_has_calls([call(instance) for instance in mock_instances])
     mock_repo.session.commit.assert_not_called()
 
 
-async def test_sqlalchemy_repo_list_with_pagination(
+async def test_sqlalchemy_repo_list_yield_per(
     mock_repo: SQLAlchemyRepository, monkeypatch: MonkeyPatch
 ) -> None:
+    """Test that unpaginated list operation streams results if `yield_per` is
+    set."""
+    monkeypatch.setattr(mock_repo, "yield_per", 1000)
+    mock_instances = [MagicMock(), MagicMock()]
+    result_mock = MagicMock()
+    result_mock.scalars.return_value.partitions.return_value.__aiter__.return_value = [
+        mock_instances
+    ]
+    mock_repo.session.stream.return_value = result_mock
+    instances = await mock_repo.list()
+    assert instances == mock_instances
+    mock_repo._select.execution_options.assert_called_once_with(yield_per=1000)
+    mock_repo.session.execute.assert_not_called()
+    mock_repo.session.expunge.assert_has_calls([call(instance) for instance in mock_instances])
+
+
+async def test_sqlalchemy_repo_list_with_subqueryload() -> None:
+    """Test that list operation doesn't set `yield_per` by default, as it
+    can't be combined with loaders such as `subqueryload()`."""
+    select_ = select(Book).options(subqueryload(Book.author))
+    repo = BookRepository(session=AsyncMock(spec=AsyncSession), select_=select_)
+    repo.session.execute.return_value = MagicMock()
+    await repo.list()
+    repo.session.execute.assert_called_once_with(select_)
+    (statement,) = repo.session.execute.call_args.args
+    assert "yield_per" not in statement.get_execution_options()
+    repo.session.stream.assert_not_called()
+
+
+async def test_sqlalchemy_repo_list_with_pagination(mock_repo: SQLAlchemyRepository) -> None:
     """Test list operation with pagination."""
+    mock_instances = [MagicMock(), MagicMock()]
     result_mock = MagicMock()
-    execute_mock = AsyncMock(return_value=result_mock)
-    monkeypatch.setattr(mock_repo, "_execute", execute_mock)
+    result_mock.scalars.return_value.all.return_value = mock_instances
+    mock_repo.session.execute.return_value = result_mock
     mock_repo._select.limit.return_value = mock_repo._select
     mock_repo._select.offset.return_value = mock_repo._select
-    await mock_repo.list(LimitOffset(2, 3))
+    instances = await mock_repo.list(LimitOffset(2, 3))
+    assert instances is mock_instances
     mock_repo._select.limit.assert_called_once_with(2)
     mock_repo._select.limit().offset.assert_called_once_with(3)  # type:ignore[call-arg]
+    mock_repo.session.stream.assert_not_called()
 
 
 async def test_sqlalchemy_repo_list_with_before_after_filter(
-    mock_repo: SQLAlchemyRepository, monkeypatch: MonkeyPatch
+    mock_repo: SQLAlchemyRepository,
 ) -> None:
     """Test list operation with BeforeAfter filter."""
     field_name = "updated"
     # model has to support comparison with the datetimes
     getattr(mock_repo.model_type, field_name).__lt__ = lambda self, compare: "lt"
     getattr(mock_repo.model_type, field_name).__gt__ = lambda self, compare: "gt"
-    result_mock = MagicMock()
-    execute_mock = AsyncMock(return_value=result_mock)
-    monkeypatch.setattr(mock_repo, "_execute", execute_mock)
+    mock_repo.session.execute.return_value = MagicMock()
     mock_repo._select.where.return_value = mock_repo._select
     await mock_repo.list(BeforeAfter(field_name, datetime.max, datetime.min))
-    assert mock_repo._select.where.call_count == 2
-    assert mock_repo._select.where.has_calls([call("gt"), call("lt")])
+    mock_repo._select.where.assert_called_once_with("lt", "gt")
 
 
-async def test_sqlalchemy_repo_list_with_collection_filter(
-    mock_repo: SQLAlchemyRepository, monkeypatch: MonkeyPatch
-) -> None:
+async def test_sqlalchemy_repo_list_with_collection_filter(mock_repo: SQLAlchemyRepository) -> None:
     """Test behavior of list operation given CollectionFilter."""
     field_name = "id"
-    result_mock = MagicMock()
-    execute_mock = AsyncMock(return_value=result_mock)
-    monkeypatch.setattr(mock_repo, "_execute", execute_mock)
+    mock_repo.session.execute.return_value = MagicMock()
     mock_repo._select.where.return_value = mock_repo._select
     values = [1, 2, 3]
     await mock_repo.list(CollectionFilter(field_name, values))
@@ -165,18 +221,35 @@ async def test_sqlalchemy_repo_update(
     mock_instance = MagicMock()
     get_id_value_mock = MagicMock(return_value=id_)
     monkeypatch.setattr(mock_repo, "get_id_attribute_value", get_id_value_mock)
-    get_mock = AsyncMock()
-    monkeypatch.setattr(mock_repo, "get", get_mock)
+    mock_repo.model_type.id.__eq__ = lambda self, other: f"id == {other}"
+    mock_repo.session.execute.return_value = MagicMock()
     mock_repo.session.merge.return_value = mock_instance
     instance = await mock_repo.update(mock_instance)
     assert instance is mock_instance
+    mock_repo._select.where.assert_called_once_with("id == 3")
+    mock_repo.session.execute.assert_called_once_with(mock_repo._select.where.return_value)
+    mock_repo.session.get.assert_not_called()
+    mock_repo.session.expunge.assert_called_once_with(mock_instance)
     mock_repo.session.merge.assert_called_once_with(mock_instance)
     mock_repo.session.flush.assert_called_once()
     mock_repo.session.refresh.assert_called_once_with(mock_instance)
-    mock_repo.session.expunge.assert_called_once_with(mock_instance)
     mock_repo.session.commit.assert_not_called()
 
 
+async def test_sqlalchemy_repo_update_not_found(
+    mock_repo: SQLAlchemyRepository, monkeypatch: MonkeyPatch
+) -> None:
+    """Test that update raises, and doesn't merge, if the instance doesn't
+    exist."""
+    monkeypatch.setattr(mock_repo, "get_id_attribute_value", MagicMock(return_value=3))
+    mock_repo.session.execute.return_value = MagicMock(
+        scalar_one_or_none=MagicMock(return_value=None)
+    )
+    with pytest.raises(NotFoundError):
+        await mock_repo.update(MagicMock())
+    mock_repo.session.merge.assert_not_called()
+
+
 async def test_sqlalchemy_repo_upsert(mock_repo: SQLAlchemyRepository) -> None:
     """Test the sequence of repo calls for upsert operation."""
     mock_instance = MagicMock()
@@ -210,6 +283,18 @@ def test_filter_in_collection_noop_if_collection_empty(mock_repo: SQLAlchemyRepo
     mock_repo._select.where.assert_not_called()
 
 
+def test_filter_in_collection_binds_array_if_collection_large(monkeypatch: MonkeyPatch) -> None:
+    """Test that collections over `in_list_max` are bound as a single array
+    parameter."""
+    repo = AuthorRepository(session=AsyncMock(spec=AsyncSession))
+    monkeypatch.setattr(repo, "in_list_max", 2)
+    values = [uuid4() for _ in range(3)]
+    repo._filter_in_collection("id", values)
+    compiled = repo._select.compile(dialect=asyncpg.dialect())  # type:ignore[no-untyped-call]
+    assert "author.id = ANY ($1)" in str(compiled)
+    assert list(compiled.params.values()) == [values]
+
+
 @pytest.mark.parametrize(
     ("before", "after"),
     [
@@ -228,6 +313,22 @@ def test__filter_on_datetime_field(
     mock_repo._filter_on_datetime_field("updated", before, after)
 
 
+def test_filter_on_datetime_field_compares_after(mock_repo: SQLAlchemyRepository) -> None:
+    """Test that the lower bound of the filter is compared against `after`."""
+    field_mock = MagicMock()
+    field_mock.__gt__ = lambda self, other: other
+    mock_repo.model_type.updated = field_mock
+    mock_repo._select.where.return_value = mock_repo._select
+    mock_repo._filter_on_datetime_field("updated", None, datetime.min)
+    mock_repo._select.where.assert_called_once_with(datetime.min)
+
+
+def test_filter_on_datetime_field_noop_if_no_bounds(mock_repo: SQLAlchemyRepository) -> None:
+    """Ensures we don't filter if neither `before` or `after` are given."""
+    mock_repo._filter_on_datetime_field("updated", None, None)
+    mock_repo._select.where.assert_not_called()
+
+
 def test_filter_collection_by_kwargs(mock_repo: SQLAlchemyRepository) -> None:
     """Test `filter_by()` called with kwargs."""
     mock_repo.filter_collection_by_kwargs(a=1, b=2)
@@ -244,3 +345,40 @@ def test_filter_collection_by_kwargs_raises_repository_exception_for_attribute_e
     )
     with pytest.raises(StarliteSaqlalchemyError):
         mock_repo.filter_collection_by_kwargs(a=1)
+
+
+def test_default_select_shared_between_instances() -> None:
+    """Test that repositories of the same model start from the same select
+    construct."""
+    first = AuthorRepository(session=AsyncMock(spec=AsyncSession))
+    second = AuthorRepository(session=AsyncMock(spec=AsyncSession))
+    assert first._select is second._select
+
+
+def test_id_column_resolved_on_subclass() -> None:
+    """Test that the id attribute of the model is resolved when the repository
+    is defined."""
+    assert AuthorRepository._id_column is AuthorRepository.model_type.id
+
+
+def test_expunge_many(mock_repo: SQLAlchemyRepository) -> None:
+    """Test that each instance is expunged, without clearing the session."""
+    mock_instances = [MagicMock(), MagicMock()]
+    mock_repo._expunge_many(mock_instances)
+    mock_repo.session.expunge.assert_has_calls([call(instance) for instance in mock_instances])
+    mock_repo.session.expunge_all.assert_not_called()
+
+
+def test_filter_select_by_kwargs(mock_repo: SQLAlchemyRepository) -> None:
+    """Test that kwargs filters are applied in a single `where()` call."""
+    mock_repo.model_type.a.__eq__ = lambda self, other: f"a == {other}"
+    mock_repo.model_type.b.__eq__ = lambda self, other: f"b == {other}"
+    mock_repo._select.where.return_value = mock_repo._select
+    mock_repo._filter_select_by_kwargs(a=1, b=2)
+    mock_repo._select.where.assert_called_once_with("a == 1", "b == 2")
+
+
+def test_filter_select_by_kwargs_noop_if_no_kwargs(mock_repo: SQLAlchemyRepository) -> None:
+    """Ensures we don't filter if there are no kwargs."""
+    mock_repo._filter_select_by_kwargs()
+    mock_repo._select.where.assert_not_called()
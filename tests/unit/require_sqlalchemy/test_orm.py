@@ -1,29 +1,23 @@
 """Tests for application ORM configuration."""
 
-import datetime
-from unittest.mock import MagicMock
-
 from starlite_saqlalchemy.db import orm
 
 
-def test_sqla_touch_updated_timestamp() -> None:
-    """Test that we are hitting the updated timestamp."""
-    mock_session = MagicMock()
-    mock_session.dirty = [MagicMock(), MagicMock()]
-    orm.touch_updated_timestamp(mock_session)
-    for mock_instance in mock_session.dirty:
-        assert isinstance(mock_instance.updated, datetime.datetime)
+def test_sqla_updated_timestamp_onupdate() -> None:
+    """Test that the updated timestamp is bumped by an `onupdate` default."""
+
+    class Model(orm.AuditBase):
+        """orm.AuditBase has an 'updated' attribute."""
+
+    onupdate = Model.__table__.c.updated.onupdate
+    assert onupdate is not None
+    assert onupdate.is_callable
 
 
-def test_sqla_touch_updated_no_updated() -> None:
-    """Test that we don't hit the updated timestamp if model doesn't have
-    one."""
+def test_sqla_created_timestamp_no_onupdate() -> None:
+    """Test that the created timestamp isn't touched on update."""
 
-    class Model(orm.Base):
-        """orm.Base has no 'updated' attribute."""
+    class Model(orm.AuditBase):
+        """orm.AuditBase has a 'created' attribute."""
 
-    instance = Model()
-    assert "updated" not in vars(instance)
-    mock_session = MagicMock(dirty=[instance])
-    orm.touch_updated_timestamp(mock_session)
-    assert "updated" not in vars(instance)
+    assert Model.__table__.c.created.onupdate is None